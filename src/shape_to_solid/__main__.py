@@ -0,0 +1,5 @@
+from .main import cli
+
+# Guarded so worker processes that re-import the main module don't rerun the CLI
+if __name__ == "__main__":
+    cli()
@@ -1,8 +1,8 @@
-from main import  llm_architect
+from main import LLM_ENDPOINT, get_llm
 
-# Simple connectivity check
+# Simple connectivity check, using the same client as the agents
 try:
-    response = llm_architect.call([{"role": "user", "content": "Ping"}])
-    print("Connection to GitHub Copilot successful!")
+    response = get_llm("architect").call([{"role": "user", "content": "Ping"}])
+    print(f"Connection to {LLM_ENDPOINT['model']} successful!")
 except Exception as e:
-    print(f"Connection failed. Check your GITHUB_COPILOT_TOKEN. Error: {e}")
\ No newline at end of file
+    print(f"Connection failed. Check your {LLM_ENDPOINT['api_key_env']}. Error: {e}")
@@ -1,48 +1,403 @@
+import argparse
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+import shlex
+import sqlite3
+import sys
+import threading
 import yaml
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from string import Formatter
+from typing import Literal
 
 from dotenv import load_dotenv
+from litellm.types.utils import ChatCompletionMessageToolCall
 
 from crewai import Agent, Task, Crew, Process, LLM
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMCallType, LLMStreamChunkEvent
+from crewai.events.types.task_events import TaskCompletedEvent, TaskStartedEvent
+from crewai.events.types.tool_usage_events import ToolUsageErrorEvent, ToolUsageStartedEvent
 from crewai.tools import tool
 from crewai_tools import FileReadTool, DirectoryReadTool, FileWriterTool
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+AGENT_DOCS = PROJECT_ROOT / "agent_docs"
+BLUEPRINTS = PROJECT_ROOT / "blueprints"
+
+# Shapes to convert, mapped to their SHACL file under {shapes_path}/shapes/
+SHAPE_FILES = {
+    "Email": "Email/emailShape.ttl",
+}
+
+# Number of file reads kept by CachedFileReadTool
+FILE_READ_CACHE_SIZE = 128
+
+# Upper bound on developer crews talking to the provider at the same time
+MAX_PARALLEL_SHAPES = 3
+
+# Every role talks to the same endpoint and model (OpenAI's default API), so the
+# provider's prompt cache is shared between them. The API key is read from the
+# environment when a client is first built, see get_llm().
+LLM_ENDPOINT = {
+    "model": "gpt-4o",
+    "api_key_env": "OPENAI_API_KEY",
+}
+
+# Per-role sampling settings
+LLM_SETTINGS = {
+    "architect": {
+        "temperature": 1,
+        "stream": True,
+    },
+    "developer": {
+        "temperature": 1,
+        "stream": True,
+    },
+}
+
+# SQLite file holding LLM responses for deterministic reruns. Only calls at or
+# below LLM_CACHE_MAX_TEMPERATURE are cached; set LLM_RESPONSE_CACHE=1 to cache
+# every call or LLM_RESPONSE_CACHE=0 to disable the cache. Both roles run at
+# temperature 1, so with the default settings nothing is cached until
+# LLM_RESPONSE_CACHE=1 is set.
+LLM_CACHE_PATH = PROJECT_ROOT / ".llm_cache" / "responses.sqlite3"
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+
+# Completion params left out of the cache key: they don't affect the response
+LLM_CACHE_IGNORED_PARAMS = ("api_key", "timeout", "stream", "stream_options")
+
+
+# Tool calls accumulated by the stream currently handled on this thread
+_streamed_tool_calls = threading.local()
+
+
+def _connect_response_cache() -> sqlite3.Connection:
+    LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(LLM_CACHE_PATH, timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+    return conn
+
+
+def _read_cached_response(key: str) -> str | None:
+    with closing(_connect_response_cache()) as conn:
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _write_cached_response(key: str, response: str) -> None:
+    with closing(_connect_response_cache()) as conn, conn:
+        conn.execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+
+
+def _serialize_response(response) -> str | None:
+    """Encode a text or tool-call response for the cache, or None if it can't be cached."""
+    if isinstance(response, str):
+        return json.dumps({"text": response})
+    if isinstance(response, list) and response and all(hasattr(call, "function") for call in response):
+        return json.dumps({"tool_calls": [
+            {
+                "id": call.id,
+                "type": "function",
+                "function": {"name": call.function.name, "arguments": call.function.arguments},
+            }
+            for call in response
+        ]})
+    return None
+
+
+def _deserialize_response(payload: str):
+    """Rebuild a cached response as call() would have returned it."""
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return None
+    if "tool_calls" in data:
+        return [ChatCompletionMessageToolCall(**call) for call in data["tool_calls"]]
+    return data.get("text")
+
+
+class PromptCachingLLM(LLM):
+    """LLM that lets the provider reuse the static system prompt across calls.
+
+    CrewAI puts the agent role, goal and backstory in the system message, which
+    is byte-identical for every kickoff of the same agent. For Anthropic models
+    the system message is marked with a ``cache_control`` breakpoint; OpenAI
+    caches long prompt prefixes automatically, so there the messages are passed
+    through unchanged. Cached prompt tokens are logged to verify the hit rate.
+
+    Text and tool-call responses are also memoized on disk, keyed on the full
+    completion request, see LLM_CACHE_PATH, so rerunning an unchanged
+    conversation costs no tokens.
+    """
+
+    def __new__(cls, model: str, **kwargs):
+        # LLM.__new__ hands some models to native provider classes; force the
+        # LiteLLM path so this subclass's call() is actually used.
+        kwargs["is_litellm"] = True
+        return super().__new__(cls, model=model, **kwargs)
+
+    def __init__(self, model: str, **kwargs):
+        kwargs["is_litellm"] = True
+        super().__init__(model=model, **kwargs)
+
+    def _supports_cache_control(self) -> bool:
+        model = self.model.lower()
+        return model.startswith("anthropic/") or "claude" in model
+
+    def _mark_system_prompt(self, messages):
+        if isinstance(messages, str) or not self._supports_cache_control():
+            return messages
+        marked = []
+        for message in messages:
+            if message.get("role") == "system" and isinstance(message.get("content"), str):
+                message = {
+                    **message,
+                    "content": [{
+                        "type": "text",
+                        "text": message["content"],
+                        "cache_control": {"type": "ephemeral"},
+                    }],
+                }
+            marked.append(message)
+        return marked
+
+    def _handle_streaming_tool_calls(self, tool_calls, accumulated_tool_args, available_functions=None,
+                                     from_task=None, from_agent=None, response_id=None):
+        # Only the first delta of each tool call carries its id; keep it, and
+        # the accumulated name/arguments, for _handle_streaming_response.
+        _streamed_tool_calls.accumulated = accumulated_tool_args
+        for tool_call in tool_calls:
+            if tool_call.id:
+                _streamed_tool_calls.ids[tool_call.index] = tool_call.id
+        return super()._handle_streaming_tool_calls(
+            tool_calls=tool_calls,
+            accumulated_tool_args=accumulated_tool_args,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_id=response_id,
+        )
+
+    def _handle_streaming_response(self, params: dict, callbacks=None, available_functions=None,
+                                   from_task=None, from_agent=None, response_model=None):
+        # LiteLLM streaming accumulates tool calls but only returns them when it
+        # executes them itself. The agent executor runs native tools on its own
+        # (available_functions=None), so return the streamed calls to it the
+        # way the non-streaming path does: when the model produced no text.
+        _streamed_tool_calls.accumulated = {}
+        _streamed_tool_calls.ids = {}
+        response = super()._handle_streaming_response(
+            params=params,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        accumulated, ids = _streamed_tool_calls.accumulated, _streamed_tool_calls.ids
+        if available_functions or not isinstance(response, str) or response.strip():
+            return response
+        tool_calls = [
+            ChatCompletionMessageToolCall(
+                id=ids.get(index),
+                type="function",
+                function={"name": call.function.name, "arguments": call.function.arguments or "{}"},
+            )
+            for index, call in sorted(accumulated.items())
+            if call.function.name
+        ]
+        return tool_calls or response
+
+    def _track_token_usage_internal(self, usage_data) -> None:
+        # Called once per response with that response's own usage, so the log
+        # stays correct when several threads share this instance.
+        super()._track_token_usage_internal(usage_data)
+        details = usage_data.get("prompt_tokens_details")
+        if isinstance(details, dict):
+            details_cached = details.get("cached_tokens")
+        else:
+            details_cached = getattr(details, "cached_tokens", None)
+        cached_tokens = (
+            usage_data.get("cached_tokens")
+            or usage_data.get("cached_prompt_tokens")
+            or details_cached
+            or 0
+        )
+        logger.info(
+            "%s: %d prompt tokens, %d cached",
+            self.model,
+            usage_data.get("prompt_tokens") or 0,
+            cached_tokens,
+        )
+
+    def _use_response_cache(self, available_functions) -> bool:
+        # With available_functions, call() runs the tools itself, so replaying
+        # the response would skip their side effects. Without them (the agent
+        # executor's native-tool loop) tool calls are returned and run by the
+        # executor, so cached tool calls are replayed like live ones.
+        if available_functions:
+            return False
+        setting = os.getenv("LLM_RESPONSE_CACHE")
+        if setting is not None:
+            return setting == "1"
+        return self.temperature is not None and self.temperature <= LLM_CACHE_MAX_TEMPERATURE
+
+    def _response_cache_key(self, messages, tools, response_model=None) -> str:
+        # Key on everything sent to the provider that can change the answer
+        # (model, endpoint, sampling and token limits, tools, ...), but not on
+        # the credential, timeout or transport settings.
+        params = {
+            key: value
+            for key, value in self._prepare_completion_params(messages, tools).items()
+            if key not in LLM_CACHE_IGNORED_PARAMS
+        }
+        for key, model in (("response_format", params.get("response_format")), ("response_model", response_model)):
+            if hasattr(model, "model_json_schema"):
+                params[key] = model.model_json_schema()
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        cache_key = None
+        if self._use_response_cache(available_functions):
+            cache_key = self._response_cache_key(messages, tools, response_model)
+            payload = _read_cached_response(cache_key)
+            cached = _deserialize_response(payload) if payload is not None else None
+            if cached is not None:
+                logger.info("%s: response served from %s", self.model, LLM_CACHE_PATH)
+                return cached
+
+        response = super().call(
+            self._mark_system_prompt(messages),
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        if cache_key is not None:
+            payload = _serialize_response(response)
+            if payload is not None:
+                _write_cached_response(cache_key, payload)
+        return response
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load the .env file once per process."""
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=None)
+def _enable_stream_echo() -> None:
+    """Write streamed LLM tokens to stdout as they arrive (registered once)."""
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def echo_chunk(source, event):
+        # Tool-call chunks carry argument JSON (or None); those are logged as tool usage instead
+        if event.call_type != LLMCallType.LLM_CALL or not event.chunk:
+            return
+        sys.stdout.write(event.chunk)
+        sys.stdout.flush()
 
-CURRENT_DIR = os.path.dirname(__file__)
-PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, '../../'))
 
-llm_architect = LLM(
-    model="gpt-4o",
-    api_key=os.getenv("GITHUB_COPILOT_TOKEN"),
-    base_url="https://models.github.ai/inference",
-    temperature=1,
-    max_tokens=8000
-)
+def _agent_role(task) -> str:
+    return task.agent.role if task is not None and task.agent is not None else "unknown agent"
 
-llm_architect_gpt = LLM(
-    model="gpt-4o",
-    temperature=1
-)
+
+@functools.lru_cache(maxsize=None)
+def _enable_event_logging() -> None:
+    """Report crew progress through logging instead of CrewAI's verbose output (registered once)."""
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def log_task_started(source, event):
+        logger.info("%s started its task", _agent_role(event.task))
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def log_task_completed(source, event):
+        logger.info("%s completed its task", _agent_role(event.task))
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def log_tool_started(source, event):
+        logger.info("%s is using %s with %s", event.agent_role, event.tool_name, event.tool_args)
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def log_tool_error(source, event):
+        logger.warning("%s failed: %s", event.tool_name, event.error)
+
+
+def _configure_logging(level: int = logging.INFO) -> None:
+    """Show this module's log records at ``level``, leaving other loggers alone.
+
+    Called by the command line and worker process entry points; library
+    callers of main() keep their own logging setup. Records go through a queue
+    so agent threads never block on stderr writes. Only this module's logger is
+    configured, so httpx and LiteLLM INFO records stay hidden. Does nothing if
+    the logger already has a handler.
+    """
+    if logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    # Root handlers configured by the caller would print every record a second time
+    logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+
+
+@functools.lru_cache(maxsize=None)
+def get_llm(role: str) -> LLM:
+    """Return the shared LLM client for the given role, building it on first use."""
+    _load_env()
+    settings = {**LLM_ENDPOINT, **LLM_SETTINGS[role]}
+    api_key_env = settings.pop("api_key_env", None)
+    if api_key_env:
+        settings["api_key"] = os.getenv(api_key_env)
+    return PromptCachingLLM(**settings)
 
 
 @tool("Run Shell Command")
-def run_shell_command(command: str) -> str:
+def run_shell_command(command: str, working_dir: str = "") -> str:
     """
-    Run a shell command and return the output.
-    Use this tool to execute shell commands like running TypeScript compiler to check for errors.
+    Run a command and return the output.
+    Use this tool to execute commands like running TypeScript compiler to check for errors.
+    The command is run directly, not through a shell, so shell syntax such as
+    `cd`, `&&`, pipes or redirects is not supported; use working_dir instead of `cd`.
 
     Args:
-        command: The shell command to execute (e.g., 'deno check src/solid/Email.ts')
+        command: The command to execute (e.g., 'npx tsc --noEmit src/solid/Email.ts')
+        working_dir: Directory to run the command in (defaults to the current directory)
 
     Returns:
         The stdout and stderr output of the command, or an error message if the command fails.
     """
     try:
+        argv = shlex.split(command)
+        if not argv:
+            return "Error: no command given"
         result = subprocess.run(
-            command,
-            shell=True,
+            argv,
+            cwd=working_dir or None,
             capture_output=True,
             text=True,
             timeout=60
@@ -57,153 +412,503 @@ def run_shell_command(command: str) -> str:
         return output if output else "Command completed successfully with no output."
     except subprocess.TimeoutExpired:
         return "Error: Command timed out after 60 seconds."
+    except FileNotFoundError as e:
+        return f"Error: Command or working directory not found: {e.filename}"
     except Exception as e:
         return f"Error executing command: {str(e)}"
 
-def load_agent_config(agent_name: str, **format_kwargs) -> dict:
-    """Load agent configuration from YAML file and format with provided kwargs."""
-    config_path = os.path.join(PROJECT_ROOT, 'agent_docs', f'{agent_name}.yaml')
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
 
-    # Format all string values with provided kwargs
-    for key, value in config.items():
-        if isinstance(value, str):
-            config[key] = value.format(**format_kwargs)
+@functools.lru_cache(maxsize=None)
+def _load_blueprints() -> dict[str, str]:
+    """Read every blueprint file once; they don't change during a run."""
+    return {
+        path.relative_to(PROJECT_ROOT).as_posix(): path.read_text()
+        for path in sorted(BLUEPRINTS.rglob("*")) if path.is_file()
+    }
+
+
+@tool("Read Blueprint")
+def read_blueprint(path: str) -> str:
+    """
+    Read a file from the project's blueprints directory, such as blueprints/rules.md.
+    Use this tool instead of the file read tool for blueprint files; they are kept in memory.
+
+    Args:
+        path: Path of the blueprint file, relative to the project folder (e.g., 'blueprints/rules.md') or absolute
+
+    Returns:
+        The content of the file, or an error message listing the available blueprint files.
+    """
+    blueprints = _load_blueprints()
+    key = Path(path)
+    if key.is_absolute():
+        try:
+            key = key.resolve().relative_to(PROJECT_ROOT)
+        except ValueError:
+            pass
+    content = blueprints.get(key.as_posix())
+    if content is None:
+        return f"Error: {path} is not a blueprint file. Available files: {', '.join(blueprints)}"
+    return content
+
+
+_file_read_cache: OrderedDict = OrderedDict()
+_file_read_lock = threading.Lock()
+
+
+class CachedFileReadTool(FileReadTool):
+    """FileReadTool that serves repeated reads of unchanged files from memory.
+
+    Results are kept in a bounded LRU keyed by the file's real path, mtime and
+    the requested line range, so edits made during a run invalidate the entry.
+    The cache is shared by all instances and crews in the process.
+    """
+
+    def _run(self, file_path: str | None = None, start_line: int | None = 1,
+             line_count: int | None = None, **kwargs) -> str:
+        path = file_path or self.file_path
+        try:
+            key = (os.path.realpath(path), os.stat(path).st_mtime_ns, start_line, line_count)
+        except (OSError, TypeError):
+            # Let FileReadTool report missing files and bad arguments
+            return super()._run(file_path=file_path, start_line=start_line,
+                                line_count=line_count, **kwargs)
+
+        with _file_read_lock:
+            if key in _file_read_cache:
+                _file_read_cache.move_to_end(key)
+                return _file_read_cache[key]
+
+        content = super()._run(file_path=file_path, start_line=start_line,
+                               line_count=line_count, **kwargs)
+
+        with _file_read_lock:
+            _file_read_cache[key] = content
+            while len(_file_read_cache) > FILE_READ_CACHE_SIZE:
+                _file_read_cache.popitem(last=False)
+        return content
+
+
+@functools.lru_cache(maxsize=None)
+def get_tools() -> tuple:
+    """Return the tool instances shared by every agent and crew in the process."""
+    # File reading tools for different directories
+    file_read_tool = CachedFileReadTool()
+    dir_read_tool = DirectoryReadTool()
+    file_write_tool = FileWriterTool()
+    return (read_blueprint, file_read_tool, dir_read_tool, file_write_tool, run_shell_command)
+
+
+# libyaml's C loader when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-    return config
+_FORMATTER = Formatter()
+
+
+def _compile_template(text: str) -> tuple:
+    """Parse a format string once into (literal, field, spec, conversion) parts."""
+    return tuple(_FORMATTER.parse(text))
+
+
+def _render_template(parts: tuple, values: dict) -> str:
+    """Substitute values into a compiled template.
+
+    Fields without a value are kept as {placeholders}, so they can be supplied
+    later as Crew kickoff inputs.
+    """
+    chunks = []
+    for literal, field_name, format_spec, conversion in parts:
+        chunks.append(literal)
+        if field_name is None:
+            continue
+        if field_name not in values:
+            conversion = f"!{conversion}" if conversion else ""
+            format_spec = f":{format_spec}" if format_spec else ""
+            chunks.append(f"{{{field_name}{conversion}{format_spec}}}")
+            continue
+        value = values[field_name]
+        if conversion:
+            value = _FORMATTER.convert_field(value, conversion)
+        chunks.append(format(value, format_spec or ""))
+    return "".join(chunks)
+
+
+@dataclass(frozen=True, slots=True)
+class AgentConfig:
+    """Agent and task settings from an agent_docs/*.yaml file."""
+
+    role: str
+    goal: str
+    backstory: str
+    task_description: str
+    expected_output: str
+    output_file: str | None = None
+
+
+@functools.lru_cache(maxsize=32)
+def _load_compiled_config(config_path: Path, mtime_ns: int) -> dict:
+    """Parse a YAML config file and compile its string values as templates.
+
+    The mtime key invalidates the cache when the file is edited.
+    """
+    config = yaml.load(config_path.read_bytes(), Loader=_YAML_LOADER)
+    return {
+        key: _compile_template(value) if isinstance(value, str) else value
+        for key, value in config.items()
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _format_config(config_path: Path, mtime_ns: int, format_items: frozenset) -> AgentConfig:
+    """Render all compiled string values of a config with the given items."""
+    format_kwargs = dict(format_items)
+    config = {}
+    for key, value in _load_compiled_config(config_path, mtime_ns).items():
+        if isinstance(value, tuple):
+            value = _render_template(value, format_kwargs)
+        config[key] = value
+    return AgentConfig(**config)
+
+
+def load_agent_config(agent_name: str, **format_kwargs) -> AgentConfig:
+    """Load agent configuration from YAML file and format with provided kwargs.
+
+    Placeholders without a matching kwarg are kept as-is, so they can be
+    supplied later as Crew kickoff inputs. Configs are cached until the YAML
+    file's mtime changes; being frozen, the cached instance is shared.
+    """
+    config_path = AGENT_DOCS / f"{agent_name}.yaml"
+    mtime_ns = config_path.stat().st_mtime_ns
+    return _format_config(config_path, mtime_ns, frozenset(format_kwargs.items()))
 
 
 def create_architect_agent(shapes_path: str, objects_path: str, tools: list) -> tuple[Agent, Task]:
     """Create and configure the System Architect agent and task."""
     config = load_agent_config(
         'architect',
-        project_root=PROJECT_ROOT,
+        project_root=str(PROJECT_ROOT),
         shapes_path=shapes_path,
         objects_path=objects_path
     )
 
     agent = Agent(
-        role=config['role'],
-        goal=config['goal'],
-        backstory=config['backstory'],
+        role=config.role,
+        goal=config.goal,
+        backstory=config.backstory,
         tools=tools,
-        llm=llm_architect_gpt,
-        verbose=True,
+        llm=get_llm("architect"),
+        verbose=False,
         allow_delegation=False
     )
 
     task = Task(
-        description=config['task_description'],
-        expected_output=config['expected_output'],
+        description=config.task_description,
+        expected_output=config.expected_output,
         agent=agent,
-        output_file=config['output_file']
+        output_file=config.output_file
     )
 
     return agent, task
 
 
-def create_developer_agent(
-    tools: list,
-    shape_name: str,
-    shape_file_path: str,
-    output_class_file: str,
-    output_dataset_file: str,
-    output_mod_file: str,
-    objects_path: str
-) -> tuple[Agent, Task]:
+def create_developer_agent(tools: list, objects_path: str) -> tuple[Agent, Task]:
     """Create and configure the Developer agent and task.
 
+    The task is shape-agnostic: shape_name, shape_file_path and the output file
+    paths are left as placeholders and filled from developer_inputs() at kickoff.
+    developer.yaml keeps them at the end of the task description, so the prompt
+    prefix is identical for every shape and can be served from the provider's
+    prompt cache.
+
     Args:
         tools: List of tools available to the agent
-        shape_name: Name of the shape (e.g., 'Email', 'Person')
-        shape_file_path: Full path to the SHACL shape .ttl file
-        output_class_file: Full path for the output class file (e.g., .../Email.ts)
-        output_dataset_file: Full path for the output dataset file (e.g., .../EmailDataset.ts)
-        output_mod_file: Full path to the mod.ts file to update
         objects_path: Path to the objects repository for running compiler
     """
     config = load_agent_config(
         'developer',
-        project_root=PROJECT_ROOT,
-        shape_name=shape_name,
-        shape_file_path=shape_file_path,
-        output_class_file=output_class_file,
-        output_dataset_file=output_dataset_file,
-        output_mod_file=output_mod_file,
+        project_root=str(PROJECT_ROOT),
         objects_path=objects_path
     )
 
     agent = Agent(
-        role=config['role'],
-        goal=config['goal'],
-        backstory=config['backstory'],
+        role=config.role,
+        goal=config.goal,
+        backstory=config.backstory,
         tools=tools,
-        llm=llm_architect_gpt,
-        verbose=True,
+        llm=get_llm("developer"),
+        verbose=False,
         allow_delegation=False
     )
 
     task = Task(
-        description=config['task_description'],
-        expected_output=config['expected_output'],
+        description=config.task_description,
+        expected_output=config.expected_output,
         agent=agent
     )
 
     return agent, task
 
 
+def developer_inputs(shape_name: str, shapes_path: str, objects_path: str) -> dict:
+    """Build the kickoff inputs that point the developer task at one shape.
 
-def main():
-    # Setup file tools for reading blueprints and example files
-    shapes_path = os.getenv("REPO_SHAPES_PATH")
-    objects_path = os.getenv("REPO_OBJECT_PATH")
+    Args:
+        shape_name: Name of the shape (e.g., 'Email', 'Person')
+        shapes_path: Path to the shapes repository
+        objects_path: Path to the objects repository
+    """
+    return {
+        "shape_name": shape_name,
+        "shape_file_path": f"{shapes_path}/shapes/{SHAPE_FILES[shape_name]}",
+        "output_class_file": f"{objects_path}/src/solid/{shape_name}.ts",
+        "output_dataset_file": f"{objects_path}/src/solid/{shape_name}Dataset.ts",
+    }
+
+
+def create_developer_crew(tools: list, objects_path: str) -> Crew:
+    """Create a single-developer Crew that can be kicked off once per shape."""
+    developer, developer_task = create_developer_agent(tools=tools, objects_path=objects_path)
+    return Crew(
+        agents=[developer],
+        tasks=[developer_task],
+        process=Process.sequential,
+        verbose=False
+    )
 
-    # File reading tools for different directories
-    file_read_tool = FileReadTool()
-    dir_read_tool = DirectoryReadTool()
-    file_write_tool = FileWriterTool()
-    tools = [file_read_tool, dir_read_tool, file_write_tool, run_shell_command]
 
-    # Create agents and tasks
-    # architect, architect_guide_task = create_architect_agent(shapes_path, objects_path, tools)
+async def run_developer_crews(
+    shape_names: list[str],
+    shapes_path: str,
+    objects_path: str,
+    tools: list,
+    max_parallel: int = MAX_PARALLEL_SHAPES
+) -> list:
+    """Convert several shapes concurrently, each on its own developer Crew.
+
+    Like Crew.kickoff_for_each_async, every shape runs the same shape-agnostic
+    Crew with its own inputs, so the agent prompt is identical for every shape.
+    A fresh Crew is built per shape rather than using Crew.copy(), which would
+    replace the agent's PromptCachingLLM with a plain LLM; configs and clients
+    are cached, so this is cheap.
+    The work is bound by LLM latency; at most ``max_parallel`` kickoffs are in
+    flight to stay within provider rate limits. The crews only write their own
+    shape's files; the shared mod.ts is updated afterwards by update_mod_exports().
 
-    # Configure for Email shape (change these values for different shapes)
-    shape_name = "Email"
-    developer, developer_task = create_developer_agent(
-        tools=tools,
-        shape_name=shape_name,
-        shape_file_path=f"{shapes_path}/shapes/Email/emailShape.ttl",
-        output_class_file=f"{objects_path}/src/solid/Email.ts",
-        output_dataset_file=f"{objects_path}/src/solid/EmailDataset.ts",
-        output_mod_file=f"{objects_path}/src/solid/mod.ts",
-        objects_path=objects_path
+    Returns:
+        One entry per shape, in order: the CrewOutput, or the exception the
+        shape's crew raised. A failing shape doesn't stop the others.
+    """
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def kickoff(shape_name: str):
+        crew = create_developer_crew(tools, objects_path)
+        inputs = developer_inputs(shape_name, shapes_path, objects_path)
+        async with semaphore:
+            return await crew.kickoff_async(inputs=inputs)
+
+    return await asyncio.gather(
+        *(kickoff(shape_name) for shape_name in shape_names),
+        return_exceptions=True
     )
 
+
+def update_mod_exports(objects_path: str, shape_names: list[str]) -> list[str]:
+    """Add the exports of the generated shape classes to src/solid/mod.ts.
+
+    Runs once after all developer crews have finished, so concurrent crews never
+    read-modify-write the shared file. Shapes whose class or dataset file was
+    not generated are skipped, and exports already present are not repeated.
+
+    Returns:
+        The export lines that were added.
+    """
+    solid_dir = Path(objects_path) / "src" / "solid"
+    mod_path = solid_dir / "mod.ts"
+    content = mod_path.read_text() if mod_path.exists() else ""
+    existing = {line.strip().replace("'", '"') for line in content.splitlines()}
+
+    added = []
+    for shape_name in shape_names:
+        modules = [shape_name, f"{shape_name}Dataset"]
+        if not all((solid_dir / f"{module}.ts").is_file() for module in modules):
+            logger.warning("Not exporting %s from mod.ts: generated files are missing", shape_name)
+            continue
+        for module in modules:
+            line = f'export * from "./{module}.js";'
+            if line not in existing:
+                added.append(line)
+
+    if added:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        mod_path.write_text(content + "\n".join(added) + "\n")
+    return added
+
+
+def _repo_path(env_name: str) -> str:
+    """Read a required repository path from the environment and resolve it to its real path.
+
+    Resolving once keeps the paths written into prompts and the file read cache
+    keys identical however the variable is spelled (relative, trailing slash,
+    symlinks).
+
+    Raises:
+        RuntimeError: If the variable is not set, before any LLM call is made.
+    """
+    path = os.getenv(env_name)
+    if not path:
+        raise RuntimeError(f"{env_name} is not set; add it to the environment or the .env file")
+    return os.path.realpath(path)
+
+
+def run_architect(shapes_path: str, objects_path: str, tools: list):
+    """Run the architect crew that writes agent_work/architect.md."""
+    _enable_stream_echo()
+    architect, architect_guide_task = create_architect_agent(shapes_path, objects_path, tools)
+
     # Assemble the Crew with only the architect
-    # crew = Crew(
-    #     agents=[architect],
-    #     tasks=[architect_guide_task],
-    #     process=Process.sequential,
-    #     verbose=True
-    # )
-
-    # Assemble the Crew with only the developer agent
     crew = Crew(
-        agents=[developer],
-        tasks=[developer_task],
+        agents=[architect],
+        tasks=[architect_guide_task],
         process=Process.sequential,
-        verbose=True
+        verbose=False
     )
 
-    # Run and stop after generating the code
     result = crew.kickoff()
-    print("\n" + "="*60)
-    print(f"Developer has completed {shape_name} Solid Object implementation.")
-    print(f"Output files in: {objects_path}/src/solid/")
-    print("="*60)
+    logger.info("Architect has completed the guidance document: %s", architect_guide_task.output_file)
     return result
 
 
+def process_one_shape(shape_name: str) -> str:
+    """Convert one shape in a worker process and return the crew's raw output.
+
+    Top-level so ProcessPoolExecutor can pickle it; the worker reads the
+    repository paths from its own environment and builds its own clients.
+    """
+    _configure_logging()
+    _load_env()
+    _enable_event_logging()
+    shapes_path = _repo_path("REPO_SHAPES_PATH")
+    objects_path = _repo_path("REPO_OBJECT_PATH")
+    [result] = asyncio.run(
+        run_developer_crews([shape_name], shapes_path, objects_path, list(get_tools()))
+    )
+    if isinstance(result, BaseException):
+        raise result
+    return result.raw
+
+
+def run_developer(
+    shape_names: list[str],
+    shapes_path: str,
+    objects_path: str,
+    tools: list,
+    processes: int = 0
+) -> list[str]:
+    """Run one developer crew per shape and stop after generating the code.
+
+    Args:
+        processes: When above zero, run each shape in its own worker process,
+            this many at a time. Otherwise run the crews concurrently in this
+            process.
+
+    Returns:
+        The raw output of each shape's crew, in the order of shape_names.
+
+    Raises:
+        RuntimeError: If any shape failed. Every shape still runs to the end,
+            and the shapes that succeeded are exported from mod.ts first.
+    """
+    if processes > 0:
+        # forkserver avoids forking a process that already runs client threads
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(shape_names)),
+            mp_context=multiprocessing.get_context(start_method)
+        ) as executor:
+            futures = [executor.submit(process_one_shape, shape_name) for shape_name in shape_names]
+            outcomes = [future.exception() or future.result() for future in futures]
+    else:
+        if len(shape_names) == 1:
+            # Concurrent crews would interleave their token streams
+            _enable_stream_echo()
+        outputs = asyncio.run(run_developer_crews(shape_names, shapes_path, objects_path, tools))
+        outcomes = [output if isinstance(output, BaseException) else output.raw for output in outputs]
+
+    failures = {
+        shape_name: outcome for shape_name, outcome in zip(shape_names, outcomes)
+        if isinstance(outcome, BaseException)
+    }
+    succeeded = [shape_name for shape_name in shape_names if shape_name not in failures]
+    update_mod_exports(objects_path, succeeded)
+    if succeeded:
+        logger.info(
+            "Developer has completed %s Solid Object implementation. Output files in: %s/src/solid/",
+            ", ".join(succeeded), objects_path
+        )
+    for shape_name, error in failures.items():
+        logger.error("Developer failed on %s: %r", shape_name, error)
+    if failures:
+        raise RuntimeError(f"Conversion failed for {', '.join(failures)}") from next(iter(failures.values()))
+    return outcomes
+
+
+def main(
+    mode: Literal["architect", "dev"] = "dev",
+    shape_names: list[str] | None = None,
+    processes: int = 0
+):
+    """Run the architect or the developer pipeline.
+
+    Args:
+        mode: 'architect' to write the guidance document, 'dev' to convert shapes
+        shape_names: Shapes to convert in 'dev' mode (defaults to all of SHAPE_FILES)
+        processes: Worker processes for 'dev' mode, 0 to run in this process
+
+    Returns:
+        The architect crew's CrewOutput in 'architect' mode, or the raw output
+        of each shape's crew in 'dev' mode, whichever way the shapes were run.
+    """
+    _load_env()
+    _enable_event_logging()
+    _load_blueprints()
+
+    # Setup file tools for reading blueprints and example files
+    shapes_path = _repo_path("REPO_SHAPES_PATH")
+    objects_path = _repo_path("REPO_OBJECT_PATH")
+
+    tools = list(get_tools())
+
+    if mode == "architect":
+        return run_architect(shapes_path, objects_path, tools)
+    return run_developer(shape_names or list(SHAPE_FILES), shapes_path, objects_path, tools, processes)
+
+
+def cli(argv: list[str] | None = None):
+    """Command line entry point, e.g. ``python -m shape_to_solid --mode dev --shape Email``."""
+    parser = argparse.ArgumentParser(
+        prog="shape_to_solid",
+        description="Convert SHACL shapes to TypeScript Solid Object implementations.",
+        epilog="Set LLM_RESPONSE_CACHE=1 to replay unchanged LLM calls from "
+               f"{LLM_CACHE_PATH.relative_to(PROJECT_ROOT)}; the agents run at temperature 1, "
+               "which is not cached by default."
+    )
+    parser.add_argument(
+        "--mode", choices=["architect", "dev"], default="dev",
+        help="'architect' writes the guidance document, 'dev' converts shapes (default)"
+    )
+    parser.add_argument(
+        "--shape", dest="shapes", action="append", choices=sorted(SHAPE_FILES),
+        help="Shape to convert in dev mode; repeat for several (default: all)"
+    )
+    parser.add_argument(
+        "--processes", type=int, default=0, metavar="N",
+        help="Run each shape in its own worker process, N at a time (default: 0, in-process)"
+    )
+    args = parser.parse_args(argv)
+    _configure_logging()
+    return main(args.mode, args.shapes, args.processes)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli()